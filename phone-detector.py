@@ -1,55 +1,399 @@
 #!/usr/bin/env python3
+import ctypes
+import queue
+import re
 import subprocess
+import sys
+import threading
 import time
 import pyttsx3
+from ctypes import wintypes
 from datetime import datetime
 
+# The netsh output lines we use, matched against each line of output
+NETSH_RE = re.compile(
+    r'^[ \t]*(?:SSID \d+[ \t]*:[ \t]*(?P<ssid>.*?)'
+    r'|BSSID \d+[ \t]*:[ \t]*(?P<bssid>[0-9A-Fa-f:]+)'
+    r'|Signal[ \t]*:[ \t]*(?P<signal>\d+)%'
+    r')[ \t]*$'
+)
+
+# One-shot Windows speech (SAPI) through PowerShell. The message is read from stdin
+# so network names never have to be quoted into the command line.
+SAPI_SPEAK_COMMAND = (
+    "Add-Type -AssemblyName System.Speech;"
+    "$speaker = New-Object System.Speech.Synthesis.SpeechSynthesizer;"
+    "$speaker.Rate = -2;"
+    "$speaker.SelectVoiceByHints([System.Speech.Synthesis.VoiceGender]::Female);"
+    "$stdin = New-Object System.IO.StreamReader([Console]::OpenStandardInput(), [System.Text.Encoding]::UTF8);"
+    "$speaker.Speak($stdin.ReadToEnd())"
+)
+
+# Native Wifi API (wlanapi.dll) - only available on Windows, netsh is used otherwise
+try:
+    wlanapi = ctypes.WinDLL('wlanapi')
+except (AttributeError, OSError):
+    wlanapi = None
+
+WLAN_CLIENT_VERSION = 2             # Windows Vista and later
+DOT11_BSS_TYPE_ANY = 3
+WLAN_INTF_OPCODE_MEDIA_STREAMING_MODE = 3
+
+
+class GUID(ctypes.Structure):
+    _fields_ = [
+        ('Data1', wintypes.DWORD),
+        ('Data2', wintypes.WORD),
+        ('Data3', wintypes.WORD),
+        ('Data4', ctypes.c_ubyte * 8),
+    ]
+
+
+class WLAN_INTERFACE_INFO(ctypes.Structure):
+    _fields_ = [
+        ('InterfaceGuid', GUID),
+        ('strInterfaceDescription', ctypes.c_wchar * 256),
+        ('isState', ctypes.c_uint),
+    ]
+
+
+class WLAN_INTERFACE_INFO_LIST(ctypes.Structure):
+    _fields_ = [
+        ('dwNumberOfItems', wintypes.DWORD),
+        ('dwIndex', wintypes.DWORD),
+        ('InterfaceInfo', WLAN_INTERFACE_INFO * 1),
+    ]
+
+
+class DOT11_SSID(ctypes.Structure):
+    _fields_ = [
+        ('uSSIDLength', wintypes.ULONG),
+        ('ucSSID', ctypes.c_ubyte * 32),
+    ]
+
+
+class WLAN_RATE_SET(ctypes.Structure):
+    _fields_ = [
+        ('uRateSetLength', wintypes.ULONG),
+        ('usRateSet', wintypes.USHORT * 126),
+    ]
+
+
+class WLAN_BSS_ENTRY(ctypes.Structure):
+    _fields_ = [
+        ('dot11Ssid', DOT11_SSID),
+        ('uPhyId', wintypes.ULONG),
+        ('dot11Bssid', ctypes.c_ubyte * 6),
+        ('dot11BssType', ctypes.c_uint),
+        ('dot11BssPhyType', ctypes.c_uint),
+        ('lRssi', wintypes.LONG),
+        ('uLinkQuality', wintypes.ULONG),
+        ('bInRegDomain', wintypes.BOOLEAN),
+        ('usBeaconPeriod', wintypes.USHORT),
+        ('ullTimestamp', ctypes.c_ulonglong),
+        ('ullHostTimestamp', ctypes.c_ulonglong),
+        ('usCapabilityInformation', wintypes.USHORT),
+        ('ulChCenterFrequency', wintypes.ULONG),
+        ('wlanRateSet', WLAN_RATE_SET),
+        ('ulIeOffset', wintypes.ULONG),
+        ('ulIeSize', wintypes.ULONG),
+    ]
+
+
+class WLAN_BSS_LIST(ctypes.Structure):
+    _fields_ = [
+        ('dwTotalSize', wintypes.DWORD),
+        ('dwNumberOfItems', wintypes.DWORD),
+        ('wlanBssEntries', WLAN_BSS_ENTRY * 1),
+    ]
+
+
+def _ssid(dot11_ssid):
+    """Decode a DOT11_SSID to a string"""
+    return bytes(dot11_ssid.ucSSID[:dot11_ssid.uSSIDLength]).decode('utf-8', 'replace')
+
+
+def _wlan_check(result, func, args):
+    """Raise on a non-zero WLAN API return code"""
+    if result != 0:
+        raise ctypes.WinError(result)
+    return args
+
+
+def _items(array, count):
+    """View a variable length WLAN API array as a ctypes array of count items"""
+    return ctypes.cast(ctypes.byref(array), ctypes.POINTER(array._type_ * count)).contents
+
+
+if wlanapi is not None:
+    wlanapi.WlanOpenHandle.argtypes = [
+        wintypes.DWORD, ctypes.c_void_p, ctypes.POINTER(wintypes.DWORD), ctypes.POINTER(wintypes.HANDLE)
+    ]
+    wlanapi.WlanCloseHandle.argtypes = [wintypes.HANDLE, ctypes.c_void_p]
+    wlanapi.WlanEnumInterfaces.argtypes = [
+        wintypes.HANDLE, ctypes.c_void_p, ctypes.POINTER(ctypes.POINTER(WLAN_INTERFACE_INFO_LIST))
+    ]
+    wlanapi.WlanScan.argtypes = [
+        wintypes.HANDLE, ctypes.POINTER(GUID), ctypes.POINTER(DOT11_SSID), ctypes.c_void_p, ctypes.c_void_p
+    ]
+    wlanapi.WlanSetInterface.argtypes = [
+        wintypes.HANDLE, ctypes.POINTER(GUID), ctypes.c_uint, wintypes.DWORD, ctypes.c_void_p, ctypes.c_void_p
+    ]
+    wlanapi.WlanGetNetworkBssList.argtypes = [
+        wintypes.HANDLE, ctypes.POINTER(GUID), ctypes.POINTER(DOT11_SSID), ctypes.c_uint,
+        wintypes.BOOL, ctypes.c_void_p, ctypes.POINTER(ctypes.POINTER(WLAN_BSS_LIST))
+    ]
+    wlanapi.WlanFreeMemory.argtypes = [ctypes.c_void_p]
+    wlanapi.WlanFreeMemory.restype = None
+    for func in (wlanapi.WlanOpenHandle, wlanapi.WlanCloseHandle, wlanapi.WlanEnumInterfaces,
+                 wlanapi.WlanScan, wlanapi.WlanSetInterface, wlanapi.WlanGetNetworkBssList):
+        func.restype = wintypes.DWORD
+        func.errcheck = _wlan_check
+
+
+class Network:
+    """A network seen in a scan; slots keep per-network attribute access cheap"""
+    __slots__ = ('ssid', 'signal', 'rssi', 'first_seen')
+    
+    def __init__(self, ssid, signal=0, rssi=None, first_seen=None):
+        self.ssid = ssid
+        self.signal = signal
+        self.rssi = rssi
+        self.first_seen = first_seen
+
+
 class WifiPhoneDetector:
     def __init__(self):
-        # Initialize text-to-speech engine
-        self.tts_engine = pyttsx3.init()
+        # Speech runs on its own thread so announcements never hold up scanning
+        self._tts_q = queue.Queue()
+        self._queued_messages = set()  # Messages waiting to be spoken, to skip repeats
+        self._queued_lock = threading.Lock()
+        self._tts_ready = queue.Queue(maxsize=1)  # None once speech is ready, else the init error
+        self._tts_thread = threading.Thread(target=self._tts_loop, daemon=True)
+        self._tts_thread.start()
+        error = self._tts_ready.get()
+        if error is not None:
+            raise error
         
-        # Set of known networks and their last seen time
+        # Known networks keyed by BSSID and their last seen time
         self.known_networks = {}
         
-        # Set voice properties for better announcements
-        voices = self.tts_engine.getProperty('voices')
-        self.tts_engine.setProperty('rate', 150)    # Slower speaking rate
-        # Try to use a female voice if available
-        for voice in voices:
-            if "female" in voice.name.lower():
-                self.tts_engine.setProperty('voice', voice.id)
+        # Open the WLAN API handle once and reuse it for every scan
+        self.wlan_handle = None
+        self.wlan_interfaces = []
+        if wlanapi is not None:
+            try:
+                self.open_wlan()
+            except OSError as e:
+                # e.g. the WLAN AutoConfig service is stopped - scan with netsh instead
+                print(f"WLAN API unavailable, falling back to netsh: {e}")
+                self.close_wlan()
+    
+    def _tts_loop(self):
+        """Speak queued messages until shutdown is requested"""
+        if sys.platform == 'win32':
+            self._sapi_loop()
+        else:
+            self._pyttsx3_loop()
+    
+    def _next_message(self):
+        """Take the next message off the speech queue"""
+        message = self._tts_q.get()
+        with self._queued_lock:
+            self._queued_messages.discard(message)
+        return message
+    
+    def _sapi_loop(self):
+        """Speak each message in its own PowerShell process, avoiding pyttsx3's COM state on Windows"""
+        self._tts_ready.put(None)
+        while True:
+            message = self._next_message()
+            if message is None:  # Shutdown requested
                 break
+            try:
+                # Wait here on the TTS thread so messages are spoken one after another
+                subprocess.run(
+                    ['powershell', '-NoProfile', '-NonInteractive', '-Command', SAPI_SPEAK_COMMAND],
+                    input=message.encode('utf-8'),
+                    creationflags=subprocess.CREATE_NO_WINDOW
+                )
+            except OSError as e:
+                print(f"Error speaking message: {e}")
+    
+    def _pyttsx3_loop(self):
+        """Speak queued messages; pyttsx3 is initialized here so the engine only lives on this thread"""
+        try:
+            # Initialize text-to-speech engine
+            tts_engine = pyttsx3.init()
+            
+            # Set voice properties for better announcements
+            voices = tts_engine.getProperty('voices')
+            tts_engine.setProperty('rate', 150)    # Slower speaking rate
+            # Try to use a female voice if available
+            for voice in voices:
+                if "female" in voice.name.lower():
+                    tts_engine.setProperty('voice', voice.id)
+                    break
+            
+            # Run the engine's event loop once for the life of the thread instead of
+            # starting and stopping it for every message with runAndWait()
+            tts_engine.startLoop(False)
+        except Exception as e:
+            # Hand the error to __init__ so the detector fails to start, as before
+            self._tts_ready.put(e)
+            return
+        self._tts_ready.put(None)
+        
+        try:
+            while True:
+                message = self._next_message()
+                if message is None:  # Shutdown requested
+                    break
+                try:
+                    tts_engine.say(message)
+                    while tts_engine.isBusy():
+                        tts_engine.iterate()
+                        time.sleep(0.01)
+                except Exception as e:
+                    # Keep the thread alive for the messages after this one
+                    print(f"Error speaking message: {e}")
+        finally:
+            tts_engine.endLoop()
     
     def announce(self, message):
-        """Announce message using text-to-speech"""
+        """Queue message for text-to-speech without blocking"""
         timestamp = datetime.now().strftime('%H:%M:%S')
         print(f"[{timestamp}] {message}")
-        self.tts_engine.say(message)
-        self.tts_engine.runAndWait()
+        # Skip a message that is already waiting to be spoken
+        with self._queued_lock:
+            if message in self._queued_messages:
+                return
+            self._queued_messages.add(message)
+            self._tts_q.put(message)
     
-    def get_networks(self):
-        """Get list of currently visible WiFi networks with signal strength"""
+    def stop_announcements(self, timeout=2):
+        """Drop unspoken messages and shut down the text-to-speech thread"""
+        with self._queued_lock:
+            try:
+                while True:
+                    self._tts_q.get_nowait()
+            except queue.Empty:
+                pass
+            self._queued_messages.clear()
+            self._tts_q.put(None)
+        # Don't wait out a message that is still being spoken
+        self._tts_thread.join(timeout)
+    
+    def open_wlan(self):
+        """Open a WLAN API client handle and enumerate the wireless interfaces"""
+        handle = wintypes.HANDLE()
+        negotiated_version = wintypes.DWORD()
+        wlanapi.WlanOpenHandle(WLAN_CLIENT_VERSION, None, ctypes.byref(negotiated_version), ctypes.byref(handle))
+        self.wlan_handle = handle
+        
+        interface_list = ctypes.POINTER(WLAN_INTERFACE_INFO_LIST)()
+        wlanapi.WlanEnumInterfaces(handle, None, ctypes.byref(interface_list))
         try:
-            # Run netsh command to get wireless networks with more details
-            output = subprocess.check_output(
-                ['netsh', 'wlan', 'show', 'networks', 'mode=Bssid'], 
-                universal_newlines=True
+            interfaces = _items(interface_list.contents.InterfaceInfo, interface_list.contents.dwNumberOfItems)
+            # Copy the GUIDs out before the list memory is freed
+            self.wlan_interfaces = [GUID.from_buffer_copy(info.InterfaceGuid) for info in interfaces]
+        finally:
+            wlanapi.WlanFreeMemory(interface_list)
+    
+    def set_streaming_mode(self, enabled):
+        """Turn media streaming mode on or off, which holds off the OS's own background scans"""
+        if self.wlan_handle is None:
+            return
+        value = wintypes.BOOL(enabled)
+        for guid in self.wlan_interfaces:
+            try:
+                wlanapi.WlanSetInterface(
+                    self.wlan_handle, ctypes.byref(guid), WLAN_INTF_OPCODE_MEDIA_STREAMING_MODE,
+                    ctypes.sizeof(value), ctypes.byref(value), None
+                )
+            except OSError as e:
+                print(f"Error setting media streaming mode: {e}")
+    
+    def close_wlan(self):
+        """Close the WLAN API client handle"""
+        if self.wlan_handle is not None:
+            wlanapi.WlanCloseHandle(self.wlan_handle, None)
+            self.wlan_handle = None
+    
+    def __del__(self):
+        if hasattr(self, 'wlan_handle'):
+            self.close_wlan()
+    
+    def get_networks(self):
+        """Get visible WiFi networks keyed by BSSID with signal strength"""
+        if self.wlan_handle is not None:
+            try:
+                return self.get_networks_wlanapi()
+            except OSError as e:
+                print(f"Error scanning networks: {e}")
+                return {}
+        return self.get_networks_netsh()
+    
+    def get_networks_wlanapi(self):
+        """Read the BSS list of every wireless interface from the Native Wifi API"""
+        networks = {}
+        now = datetime.now()  # One timestamp for the whole scan
+        
+        for guid in self.wlan_interfaces:
+            bss_list = ctypes.POINTER(WLAN_BSS_LIST)()
+            wlanapi.WlanGetNetworkBssList(
+                self.wlan_handle, ctypes.byref(guid), None, DOT11_BSS_TYPE_ANY,
+                False, None, ctypes.byref(bss_list)
             )
+            try:
+                for entry in _items(bss_list.contents.wlanBssEntries, bss_list.contents.dwNumberOfItems):
+                    ssid = _ssid(entry.dot11Ssid)
+                    if not ssid:  # Skip hidden networks
+                        continue
+                    networks[bytes(entry.dot11Bssid)] = Network(
+                        ssid=ssid,
+                        signal=entry.uLinkQuality,    # 0-100, same scale as netsh's Signal
+                        rssi=entry.lRssi,             # dBm
+                        first_seen=now
+                    )
+            finally:
+                wlanapi.WlanFreeMemory(bss_list)
             
+            # Ask the driver to refresh its BSS list in time for the next call
+            wlanapi.WlanScan(self.wlan_handle, ctypes.byref(guid), None, None, None)
+        
+        return networks
+    
+    def get_networks_netsh(self):
+        """Fallback for when the Native Wifi API is unavailable: parse netsh output"""
+        try:
             networks = {}
+            now = datetime.now()  # One timestamp for the whole scan
             current_ssid = None
+            current_bssid = None
             
-            # Parse the output to get SSIDs and signal strength
-            for line in output.split('\n'):
-                if 'SSID' in line and 'BSSID' not in line:
-                    ssid = line.split(':')[-1].strip()
-                    if ssid and ssid != '':
-                        current_ssid = ssid
-                        networks[ssid] = {'signal': 0, 'first_seen': datetime.now()}
-                elif 'Signal' in line and current_ssid:
-                    signal = int(line.split(':')[-1].strip().replace('%', ''))
-                    networks[current_ssid]['signal'] = signal
+            # Run netsh command and parse its output line by line as it streams in
+            with subprocess.Popen(
+                ['netsh', 'wlan', 'show', 'networks', 'mode=Bssid'],
+                stdout=subprocess.PIPE, universal_newlines=True, bufsize=1
+            ) as proc:
+                for line in proc.stdout:
+                    match = NETSH_RE.match(line)
+                    if not match:
+                        continue
+                    field = match.lastgroup
+                    value = match.group(field)
+                    if field == 'ssid':
+                        current_ssid = value
+                        current_bssid = None
+                    elif field == 'bssid':
+                        if current_ssid:
+                            current_bssid = bytes.fromhex(value.replace(':', ''))
+                            networks[current_bssid] = Network(ssid=current_ssid, signal=0, first_seen=now)
+                    elif field == 'signal' and current_bssid:
+                        networks[current_bssid].signal = int(value)
+            if proc.returncode:
+                raise subprocess.CalledProcessError(proc.returncode, proc.args)
             
             return networks
             
@@ -58,53 +402,78 @@ class WifiPhoneDetector:
             return {}
     
     def analyze_network_changes(self, current_networks):
-        """Analyze changes in network visibility"""
-        timestamp = datetime.now()
+        """Analyze changes in network visibility, returning True if anything changed"""
+        # Split into new, still visible and disappeared networks up front
+        new = current_networks.keys() - self.known_networks.keys()
+        existing = current_networks.keys() & self.known_networks.keys()
+        disappeared = self.known_networks.keys() - current_networks.keys()
+        changed = bool(new or disappeared)
         
-        # Check for new or stronger networks
-        for ssid, data in current_networks.items():
-            if ssid not in self.known_networks:
-                # New network appeared
-                if data['signal'] > 60:  # Strong signal suggests very close proximity
-                    self.announce(f"New device detected very close by with signal strength {data['signal']}%")
-                else:
-                    self.announce(f"New device detected with signal strength {data['signal']}%")
-                self.known_networks[ssid] = data
+        # Check for new networks
+        for bssid in new:
+            data = current_networks[bssid]
+            # New network appeared
+            if data.signal > 60:  # Strong signal suggests very close proximity
+                self.announce(f"New device detected very close by with signal strength {data.signal}%")
             else:
-                # Check for significant signal strength increase
-                old_signal = self.known_networks[ssid]['signal']
-                new_signal = data['signal']
-                if new_signal > old_signal + 20:  # Signal increased by more than 20%
-                    self.announce(f"Device {ssid} moving closer. Signal increased from {old_signal}% to {new_signal}%")
-                
-                self.known_networks[ssid]['signal'] = new_signal
+                self.announce(f"New device detected with signal strength {data.signal}%")
+            self.known_networks[bssid] = data
+        
+        # Check for stronger networks
+        for bssid in existing:
+            data = current_networks[bssid]
+            ssid = data.ssid
+            # Check for significant signal strength increase
+            entry = self.known_networks[bssid]
+            old_signal = entry.signal
+            new_signal = data.signal
+            if new_signal > old_signal + 20:  # Signal increased by more than 20%
+                self.announce(f"Device {ssid} moving closer. Signal increased from {old_signal}% to {new_signal}%")
+            if abs(new_signal - old_signal) > 20:
+                changed = True
+            
+            entry.signal = new_signal
         
         # Check for networks that disappeared
-        for ssid in list(self.known_networks.keys()):
-            if ssid not in current_networks:
-                self.announce(f"Device {ssid} moved out of range")
-                del self.known_networks[ssid]
+        for bssid in disappeared:
+            self.announce(f"Device {self.known_networks[bssid].ssid} moved out of range")
+            del self.known_networks[bssid]
+        
+        return changed
 
-    def start_monitoring(self, interval=10):
-        """Start continuous monitoring"""
+    def start_monitoring(self, interval=5, max_interval=60, stable_cycles=3):
+        """Start continuous monitoring, scanning less often while networks are stable"""
         self.announce("Starting phone detection monitoring")
         print("Press Ctrl+C to stop")
         print("-" * 50)
         
         try:
+            # Only our own scans while monitoring, so they don't pile up with background scans
+            self.set_streaming_mode(True)
+            scan_interval = interval
+            self._stable_cycles = 0
             while True:
                 current_networks = self.get_networks()
-                self.analyze_network_changes(current_networks)
-                time.sleep(interval)
+                if self.analyze_network_changes(current_networks):
+                    # Networks are changing - go back to scanning quickly
+                    self._stable_cycles = 0
+                    scan_interval = interval
+                else:
+                    self._stable_cycles += 1
+                    if self._stable_cycles >= stable_cycles:
+                        scan_interval = min(max_interval, scan_interval * 1.5)
+                time.sleep(scan_interval)
                 
         except KeyboardInterrupt:
             print("\nMonitoring stopped by user")
         except Exception as e:
             print(f"Error: {e}")
         finally:
-            self.tts_engine.stop()
+            self.set_streaming_mode(False)
+            self.close_wlan()
+            self.stop_announcements()
 
 if __name__ == "__main__":
     detector = WifiPhoneDetector()
-    # Scan every 10 seconds
-    detector.start_monitoring(interval=10)
+    # Scan every 5 seconds while networks change, backing off to 60 seconds when stable
+    detector.start_monitoring(interval=5, max_interval=60)
@@ -1,6 +1,18 @@
 import sys
 import logging
-from datetime import datetime
+import sqlite3
+import pyttsx3
+import time
+import json
+import queue
+import ctypes
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from ctypes import wintypes
+from dataclasses import dataclass
+from pathlib import Path
 
 # Set up logging
 logging.basicConfig(
@@ -12,77 +24,236 @@ logging.basicConfig(
     ]
 )
 
-# Try importing required packages with error handling
-required_packages = {
-    'pywifi': None,
-    'tkinter': None,
-    'pyttsx3': None,
-    'sqlite3': None
-}
+# Native Wifi API, used to hold off Windows' background scans while monitoring
+try:
+    wlanapi = ctypes.WinDLL('wlanapi')
+except (AttributeError, OSError):
+    wlanapi = None
 
-for package in required_packages:
-    try:
-        if package == 'tkinter':
-            import tkinter as tk
-            from tkinter import simpledialog
-            required_packages[package] = tk
-        elif package == 'pywifi':
-            import pywifi
-            required_packages[package] = pywifi
-        elif package == 'pyttsx3':
-            import pyttsx3
-            required_packages[package] = pyttsx3
-        elif package == 'sqlite3':
-            import sqlite3
-            required_packages[package] = sqlite3
-        
-        logging.info(f"Successfully imported {package}")
-    except ImportError as e:
-        logging.error(f"Failed to import {package}. Error: {str(e)}")
-        print(f"\nError: The required package '{package}' is not installed.")
-        print(f"Please install it using: pip install {package}")
-        if package == 'pywifi':
-            print("\nNote: For pywifi on Windows, you might also need to:")
-            print("1. Install Visual C++ build tools")
-            print("2. Run: pip install comtypes")
-        sys.exit(1)
+# One-shot Windows speech (SAPI) through PowerShell. The message is read from
+# stdin so network names never have to be quoted into the command line.
+SAPI_SPEAK_COMMAND = (
+    "Add-Type -AssemblyName System.Speech;"
+    "$speaker = New-Object System.Speech.Synthesis.SpeechSynthesizer;"
+    "$speaker.Rate = -2;"
+    "$stdin = New-Object System.IO.StreamReader([Console]::OpenStandardInput(), [System.Text.Encoding]::UTF8);"
+    "$speaker.Speak($stdin.ReadToEnd())"
+)
 
-import time
-import json
-import threading
-from pathlib import Path
+WLAN_CLIENT_VERSION = 2
+WLAN_INTF_OPCODE_MEDIA_STREAMING_MODE = 3
+
+class GUID(ctypes.Structure):
+    _fields_ = [
+        ('Data1', wintypes.DWORD),
+        ('Data2', wintypes.WORD),
+        ('Data3', wintypes.WORD),
+        ('Data4', ctypes.c_ubyte * 8)
+    ]
+
+class WLAN_INTERFACE_INFO(ctypes.Structure):
+    _fields_ = [
+        ('InterfaceGuid', GUID),
+        ('strInterfaceDescription', ctypes.c_wchar * 256),
+        ('isState', ctypes.c_uint)
+    ]
+
+class WLAN_INTERFACE_INFO_LIST(ctypes.Structure):
+    _fields_ = [
+        ('dwNumberOfItems', wintypes.DWORD),
+        ('dwIndex', wintypes.DWORD),
+        ('InterfaceInfo', WLAN_INTERFACE_INFO * 1)
+    ]
+
+@dataclass
+class NetworkRecord:
+    """A known network, keyed in WifiMonitor.known_networks by its BSSID bytes."""
+    __slots__ = ('ssid', 'custom_name', 'last_seen_ts')
+    ssid: str
+    custom_name: str
+    last_seen_ts: float  # time.time() when last seen, 0.0 if not seen this run
+
+def bssid_to_bytes(bssid):
+    """Convert a colon separated BSSID string (pywifi adds a trailing colon) to its 6 bytes."""
+    return bytes.fromhex(bssid.replace(':', ''))
+
+def wlan_call(func, *args):
+    """Call a WLAN API function, raising on a non-zero return code."""
+    result = func(*args)
+    if result != 0:
+        raise ctypes.WinError(result)
 
 class WifiMonitor:
-    def __init__(self):
+    # OR IGNORE: a row that already exists is left alone and just gets its last_seen updated
+    _INSERT_SQL = """INSERT OR IGNORE INTO networks 
+        (bssid, ssid, custom_name, first_seen, last_seen) 
+        VALUES (?, ?, ?, datetime('now', 'localtime'), datetime('now', 'localtime'))"""
+    _UPDATE_LAST_SEEN_SQL = "UPDATE networks SET last_seen = datetime('now', 'localtime') WHERE bssid = ?"
+
+    def __init__(self, root):
         logging.info("Initializing WifiMonitor")
+        # Hidden Tk root owned by the main thread; naming dialogs are scheduled onto it
+        self.root = root
+        self.stopping = threading.Event()
         try:
+            # Imported here rather than at startup; it is only needed once the monitor is created
+            import pywifi
             self.wifi = pywifi.PyWiFi()
             self.iface = self.wifi.interfaces()[0]
-            logging.info(f"Successfully initialized WiFi interface: {self.iface.name()}")
+            logging.info("Successfully initialized WiFi interface: %s", self.iface.name())
+        except ImportError as e:
+            logging.error("Failed to import pywifi: %s", e)
+            print("\nError: The required package 'pywifi' is not installed.")
+            print("Please install it using: pip install pywifi comtypes")
+            raise
         except Exception as e:
-            logging.error(f"Failed to initialize WiFi interface: {str(e)}")
+            logging.error("Failed to initialize WiFi interface: %s", e)
             raise
 
+        self.wlan_handle = None
         self.known_networks = {}
+        # known_networks, _pending_bssids and _pending_inserts are shared with the executor's workers
+        self.networks_lock = threading.Lock()
+        self._pending_bssids = set()
+        # Rows for newly named networks, written together once per scan cycle
+        self._pending_inserts = []
+        # New networks are named off the monitor thread, one dialog at a time
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self._prompt_lock = threading.Lock()
         self.db_path = Path("wifi_networks.db")
+        self.open_database()
         self.setup_database()
         self.load_known_networks()
         
+        # Text-to-speech runs on its own thread so announcements don't delay scanning
+        self._tts_q = queue.Queue()
+        self._queued_messages = set()  # Messages waiting to be spoken, to skip repeats
+        self._queued_lock = threading.Lock()
+        self._tts_ready = queue.Queue(maxsize=1)  # None once speech is ready, else the init error
+        self._tts_thread = threading.Thread(target=self._tts_loop, daemon=True)
+        self._tts_thread.start()
+        error = self._tts_ready.get()
+        if error is not None:
+            raise error
+
+    def _tts_loop(self):
+        """Speak queued announcements, through SAPI on Windows and pyttsx3 elsewhere."""
+        if sys.platform == 'win32':
+            self._sapi_loop()
+        else:
+            self._pyttsx3_loop()
+
+    def _next_message(self):
+        """Take the next announcement off the speech queue."""
+        message = self._tts_q.get()
+        with self._queued_lock:
+            self._queued_messages.discard(message)
+        return message
+
+    def _sapi_loop(self):
+        """Speak each announcement in its own PowerShell process, avoiding pyttsx3's COM state."""
+        logging.info("Using Windows speech for announcements")
+        self._tts_ready.put(None)
+        while True:
+            message = self._next_message()
+            if message is None:  # Shutdown requested
+                break
+            try:
+                # Waiting here on the TTS thread keeps announcements from talking over each other
+                subprocess.run(
+                    ['powershell', '-NoProfile', '-NonInteractive', '-Command', SAPI_SPEAK_COMMAND],
+                    input=message.encode('utf-8'),
+                    creationflags=subprocess.CREATE_NO_WINDOW
+                )
+            except Exception as e:
+                logging.error("Failed to announce message: %s", e)
+
+    def _pyttsx3_loop(self):
+        """Speak queued announcements. The engine is created and used on this thread only."""
         try:
-            self.tts_engine = pyttsx3.init()
-            self.tts_engine.setProperty('rate', 150)
+            tts_engine = pyttsx3.init()
+            tts_engine.setProperty('rate', 150)
+            # Keep one event loop running and drive it with iterate() rather
+            # than starting a new loop for every message with runAndWait()
+            tts_engine.startLoop(False)
             logging.info("Successfully initialized text-to-speech engine")
         except Exception as e:
-            logging.error(f"Failed to initialize text-to-speech: {str(e)}")
+            logging.error("Failed to initialize text-to-speech: %s", e)
+            # Hand the error to __init__ so startup fails, as it did before
+            self._tts_ready.put(e)
+            return
+        self._tts_ready.put(None)
+
+        try:
+            while True:
+                message = self._next_message()
+                if message is None:  # Shutdown requested
+                    break
+                try:
+                    tts_engine.say(message)
+                    while tts_engine.isBusy():
+                        tts_engine.iterate()
+                        time.sleep(0.01)
+                except Exception as e:
+                    logging.error("Failed to announce message: %s", e)
+        finally:
+            tts_engine.endLoop()
+
+    def open_database(self):
+        """Open the SQLite connection shared by every database operation."""
+        try:
+            # Autocommit mode; the connection is shared with the monitor thread,
+            # so writes are serialized with db_lock
+            self.conn = sqlite3.connect(
+                self.db_path, check_same_thread=False, isolation_level=None, cached_statements=128
+            )
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.db_lock = threading.Lock()
+        except Exception as e:
+            logging.error("Failed to open database: %s", e)
             raise
 
+    def close_database(self):
+        """Close the shared SQLite connection."""
+        with self.db_lock:
+            self.conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """Run the enclosed statements on the shared connection as a single transaction."""
+        with self.db_lock:
+            self.conn.execute("BEGIN")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def flush_pending_inserts(self):
+        """Write every network named since the last flush in a single transaction."""
+        with self.networks_lock:
+            rows, self._pending_inserts = self._pending_inserts, []
+        if not rows:
+            return
+
+        try:
+            with self.transaction() as conn:
+                conn.executemany(self._INSERT_SQL, rows)
+                conn.executemany(self._UPDATE_LAST_SEEN_SQL, [(row[0],) for row in rows])
+            logging.info("Saved %s new networks", len(rows))
+        except Exception as e:
+            logging.error("Failed to save new networks: %s", e)
+            # Keep them for the next attempt
+            with self.networks_lock:
+                self._pending_inserts[:0] = rows
+
     def setup_database(self):
         """Initialize SQLite database for storing network information."""
         logging.info("Setting up database")
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("""
+            self.conn.execute("""
                 CREATE TABLE IF NOT EXISTS networks (
                     bssid TEXT PRIMARY KEY,
                     ssid TEXT,
@@ -91,97 +262,194 @@ class WifiMonitor:
                     last_seen TIMESTAMP
                 )
             """)
-            conn.commit()
-            conn.close()
             logging.info("Database setup successful")
         except Exception as e:
-            logging.error(f"Database setup failed: {str(e)}")
+            logging.error("Database setup failed: %s", e)
             raise
 
     def load_known_networks(self):
         """Load known networks from database."""
         logging.info("Loading known networks")
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT bssid, ssid, custom_name FROM networks")
-            for row in cursor.fetchall():
-                self.known_networks[row[0]] = {
-                    'ssid': row[1],
-                    'custom_name': row[2]
-                }
-            conn.close()
-            logging.info(f"Loaded {len(self.known_networks)} known networks")
+            for row in self.conn.execute("SELECT bssid, ssid, custom_name FROM networks"):
+                self.known_networks[bssid_to_bytes(row[0])] = NetworkRecord(row[1], row[2], 0.0)
+            logging.info("Loaded %s known networks", len(self.known_networks))
         except Exception as e:
-            logging.error(f"Failed to load known networks: {str(e)}")
+            logging.error("Failed to load known networks: %s", e)
             raise
 
     def prompt_for_name(self, ssid, bssid):
         """Prompt user to name a new network."""
-        logging.info(f"Prompting for name for network: {ssid}")
+        logging.info("Prompting for name for network: %s", ssid)
         try:
-            root = tk.Tk()
-            root.withdraw()
-            custom_name = simpledialog.askstring(
-                "New Network Detected",
-                f"New network detected: {ssid}\nEnter a custom name for this network:",
-                parent=root
-            )
+            from tkinter import simpledialog
+
+            answer = queue.Queue(maxsize=1)
+
+            def ask():
+                # Runs on the Tk main loop; the calling worker waits for the answer
+                try:
+                    answer.put(simpledialog.askstring(
+                        "New Network Detected",
+                        f"New network detected: {ssid}\nEnter a custom name for this network:",
+                        parent=self.root
+                    ))
+                except Exception as e:
+                    logging.error("Naming dialog failed: %s", e)
+                    answer.put(None)
+
+            self.root.after_idle(ask)
+            custom_name = None
+            while not self.stopping.is_set():
+                try:
+                    custom_name = answer.get(timeout=1)
+                    break
+                except queue.Empty:
+                    continue
             
             if custom_name:
-                now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                cursor.execute(
-                    """INSERT INTO networks 
-                    (bssid, ssid, custom_name, first_seen, last_seen) 
-                    VALUES (?, ?, ?, ?, ?)""",
-                    (bssid, ssid, custom_name, now, now)
-                )
-                conn.commit()
-                conn.close()
-                self.known_networks[bssid] = {
-                    'ssid': ssid,
-                    'custom_name': custom_name
-                }
-                logging.info(f"Network named: {custom_name}")
-            root.destroy()
+                with self.networks_lock:
+                    self._pending_inserts.append((bssid, ssid, custom_name))
+                    self.known_networks[bssid_to_bytes(bssid)] = NetworkRecord(ssid, custom_name, time.time())
+                logging.info("Network named: %s", custom_name)
             return custom_name
         except Exception as e:
-            logging.error(f"Failed to prompt for network name: {str(e)}")
+            logging.error("Failed to prompt for network name: %s", e)
             return None
 
+    def _handle_new_network(self, bssid, ssid):
+        """Prompt for a new network's name and announce it. Runs on the executor."""
+        try:
+            with self._prompt_lock:
+                custom_name = self.prompt_for_name(ssid, bssid)
+
+            if custom_name:
+                self.announce_network(f"Network named {custom_name}")
+        finally:
+            with self.networks_lock:
+                self._pending_bssids.discard(bssid_to_bytes(bssid))
+
     def announce_network(self, message):
-        """Announce network using text-to-speech."""
-        logging.info(f"Announcing: {message}")
+        """Queue a text-to-speech announcement without blocking."""
+        logging.info("Announcing: %s", message)
+        # Skip a message that is already waiting to be spoken
+        with self._queued_lock:
+            if message in self._queued_messages:
+                return
+            self._queued_messages.add(message)
+            self._tts_q.put(message)
+
+    def stop_announcements(self, timeout=2):
+        """Drop unspoken announcements and shut down the text-to-speech thread."""
+        with self._queued_lock:
+            try:
+                while True:
+                    self._tts_q.get_nowait()
+            except queue.Empty:
+                pass
+            self._queued_messages.clear()
+            self._tts_q.put(None)
+        # Don't wait out an announcement that is still being spoken
+        self._tts_thread.join(timeout)
+
+    def _iface_ready(self):
+        """Check that the interface is up and not in the middle of connecting or scanning."""
         try:
-            self.tts_engine.say(message)
-            self.tts_engine.runAndWait()
+            status = self.iface.status()
         except Exception as e:
-            logging.error(f"Failed to announce message: {str(e)}")
+            logging.error("Failed to query interface status: %s", e)
+            return False
+        from pywifi import const
+        # IFACE_DISCONNECTED is an adapter that is on but not joined to a network,
+        # which scans fine; IFACE_INACTIVE is a radio that is not ready
+        return status not in (const.IFACE_INACTIVE, const.IFACE_CONNECTING, const.IFACE_SCANNING)
+
+    def set_streaming_mode(self, enabled):
+        """Turn media streaming mode, which holds off Windows' background scans, on or off."""
+        # The WLAN handle is kept open for as long as streaming mode is on
+        if wlanapi is None:
+            return
+        try:
+            if self.wlan_handle is None:
+                handle = wintypes.HANDLE()
+                negotiated_version = wintypes.DWORD()
+                wlan_call(wlanapi.WlanOpenHandle, WLAN_CLIENT_VERSION, None,
+                          ctypes.byref(negotiated_version), ctypes.byref(handle))
+                self.wlan_handle = handle
 
-    def scan_networks(self):
+            interface_list = ctypes.POINTER(WLAN_INTERFACE_INFO_LIST)()
+            wlan_call(wlanapi.WlanEnumInterfaces, self.wlan_handle, None, ctypes.byref(interface_list))
+            try:
+                count = interface_list.contents.dwNumberOfItems
+                interfaces = ctypes.cast(
+                    ctypes.byref(interface_list.contents.InterfaceInfo),
+                    ctypes.POINTER(WLAN_INTERFACE_INFO * count)
+                ).contents
+                value = wintypes.BOOL(enabled)
+                for info in interfaces:
+                    wlan_call(wlanapi.WlanSetInterface, self.wlan_handle, ctypes.byref(info.InterfaceGuid),
+                              WLAN_INTF_OPCODE_MEDIA_STREAMING_MODE, ctypes.sizeof(value), ctypes.byref(value), None)
+            finally:
+                wlanapi.WlanFreeMemory(interface_list)
+            logging.info("Media streaming mode %s", 'enabled' if enabled else 'disabled')
+        except Exception as e:
+            logging.warning("Failed to set media streaming mode: %s", e)
+
+        if not enabled and self.wlan_handle is not None:
+            wlanapi.WlanCloseHandle(self.wlan_handle, None)
+            self.wlan_handle = None
+
+    def scan_networks(self, timeout=2, poll_interval=0.1):
         """Scan for WiFi networks."""
+        if not self._iface_ready():
+            logging.info("WiFi interface is busy, skipping scan")
+            return []
+
         logging.info("Scanning for networks")
         try:
+            # scan_results() returns the driver's cached list straight away, so
+            # remember what it held before this scan to tell fresh results apart
+            before = {(network.bssid, network.signal) for network in self.iface.scan_results()}
             self.iface.scan()
-            time.sleep(2)  # Wait for scan to complete
-            results = self.iface.scan_results()
-            logging.info(f"Found {len(results)} networks")
+
+            # Return as soon as the scan has updated the results, waiting at
+            # most the full timeout as before
+            results = []
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                time.sleep(poll_interval)
+                results = self.iface.scan_results()
+                if {(network.bssid, network.signal) for network in results} != before:
+                    break
+
+            logging.info("Found %s networks", len(results))
             return results
         except Exception as e:
-            logging.error(f"Network scan failed: {str(e)}")
+            logging.error("Network scan failed: %s", e)
             return []
 
-    def monitor(self):
-        """Main monitoring loop."""
+    def monitor(self, min_interval=5, max_interval=60, stable_cycles=3):
+        """Main monitoring loop, scanning less often while the visible networks are stable."""
         logging.info("Starting WiFi monitoring...")
         print("\nWiFi Monitor is running. Check the system tray icon.")
         print("Monitoring for new networks...\n")
         
+        # Only our own scans while monitoring, so they don't pile up with background scans
+        self.set_streaming_mode(True)
+
+        interval = min_interval
+        self._stable_cycles = 0
+        previous_bssids = set()
+
         while True:
             try:
                 networks = self.scan_networks()
+                now = time.time()
+                current_bssids = {bssid_to_bytes(network.bssid) for network in networks if network.ssid}
+                # An empty result (e.g. a skipped scan) says nothing about stability
+                changed = bool(current_bssids) and current_bssids != previous_bssids
+                if current_bssids:
+                    previous_bssids = current_bssids
                 
                 for network in networks:
                     bssid = network.bssid
@@ -190,25 +458,43 @@ class WifiMonitor:
                     if not ssid:  # Skip networks with empty SSIDs
                         continue
                         
-                    if bssid not in self.known_networks:
+                    key = bssid_to_bytes(bssid)
+                    with self.networks_lock:
+                        record = self.known_networks.get(key)
+                        pending = key in self._pending_bssids
+                        if record is None:
+                            self._pending_bssids.add(key)
+                        else:
+                            record.last_seen_ts = now
+
+                    if record is None:
+                        if pending:  # Already being announced and named
+                            continue
                         print(f"\nNew network detected: {ssid}")
-                        logging.info(f"New network detected: {ssid}")
+                        logging.info("New network detected: %s", ssid)
+                        # Announce straight away; only naming waits on the user
                         self.announce_network("New signal detected")
-                        
-                        custom_name = self.prompt_for_name(ssid, bssid)
-                        
-                        if custom_name:
-                            self.announce_network(f"Network named {custom_name}")
+                        self.executor.submit(self._handle_new_network, bssid, ssid)
                     else:
-                        custom_name = self.known_networks[bssid]['custom_name']
+                        custom_name = record.custom_name
                         if custom_name:
                             print(f"Detected known network: {custom_name} ({ssid})")
                             self.announce_network(f"Detected {custom_name}")
                 
-                time.sleep(10)  # Wait before next scan
+                if changed:
+                    self._stable_cycles = 0
+                    interval = min_interval
+                elif current_bssids:  # Empty scans leave the interval as it is
+                    self._stable_cycles += 1
+                    if self._stable_cycles >= stable_cycles:
+                        interval = min(max_interval, interval * 1.5)
+
+                self.flush_pending_inserts()
+
+                time.sleep(interval)  # Wait before next scan
                 
             except Exception as e:
-                logging.error(f"Error during monitoring: {str(e)}")
+                logging.error("Error during monitoring: %s", e)
                 time.sleep(5)  # Wait before retrying
 
 def create_system_tray(root):
@@ -245,30 +531,40 @@ def create_system_tray(root):
         return None
 
 def main():
+    monitor = None
     try:
-        monitor = WifiMonitor()
+        # Create main window (hidden); it hosts every naming dialog
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+
+        monitor = WifiMonitor(root)
         
         # Create a thread for monitoring
         monitor_thread = threading.Thread(target=monitor.monitor, daemon=True)
         monitor_thread.start()
         
-        # Create main window (hidden)
-        root = tk.Tk()
-        root.withdraw()
-        
         # Create system tray icon
         icon = create_system_tray(root)
         
+        # The Tk main loop must run on this thread for the dialogs, so the tray icon runs on its own
         if icon:
-            icon.run()
-        else:
-            root.mainloop()
+            icon.run_detached()
+        root.mainloop()
 
     except Exception as e:
-        logging.error(f"Application failed to start: {str(e)}")
+        logging.error("Application failed to start: %s", e)
         print(f"\nError: {str(e)}")
         print("Check wifi_monitor.log for more details.")
         sys.exit(1)
+    finally:
+        if monitor:
+            monitor.stopping.set()
+            monitor.executor.shutdown(wait=False, cancel_futures=True)
+            monitor.set_streaming_mode(False)
+            monitor.flush_pending_inserts()
+            monitor.close_database()
+            monitor.stop_announcements()
 
 if __name__ == "__main__":
     main()